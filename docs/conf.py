@@ -43,6 +43,12 @@ intersphinx_mapping = {
     'pandas': ('https://pandas.pydata.org/docs/', None),
     'pandera': ('https://pandera.readthedocs.io/en/stable/', None),
 }
+# Sphinx fetches the inventories concurrently; don't let a slow host stall the build,
+# and reuse inventories cached in the doctree environment for up to 30 days
+intersphinx_timeout = 10
+intersphinx_cache_limit = 30
+# Only resolve object references (not :doc: targets) against external projects
+intersphinx_disabled_reftypes = ["*:doc"]
 
 # Autodoc settings
 autodoc_member_order = 'bysource'
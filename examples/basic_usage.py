@@ -3,6 +3,8 @@
 Example usage of df-enrich package.
 """
 
+from collections.abc import Mapping
+
 import pandas as pd
 import pandera as pa
 from df_enrich import EnrichAccessor
@@ -69,7 +71,7 @@ def main():
     # Profile example (basic fallback)
     print("6. Profiling example...")
     profile = df.enrich.profile()
-    if isinstance(profile, dict):
+    if isinstance(profile, Mapping):
         print("Profile (basic stats):")
         print(f"  Shape: {profile['shape']}")
         print(f"  Missing values: {profile['missing']}")
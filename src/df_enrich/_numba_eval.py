@@ -0,0 +1,121 @@
+"""
+Optional Numba fast path for simple arithmetic derive expressions.
+
+Expressions built only from numeric columns, numeric literals and ``+ - * /``
+are compiled into a single fused, parallel loop instead of going through
+``DataFrame.eval``, which allocates a temporary array per binary operation.
+"""
+import ast
+import functools
+import importlib.util
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+_BINOPS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+_UNARYOPS = {ast.UAdd: "+", ast.USub: "-"}
+
+
+def _render(node: ast.AST, names: List[str], constants: List[Union[int, float]]) -> Optional[str]:
+    """Render a supported expression node as source over ``c<n>{i}`` / ``k<n>`` placeholders."""
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        left = _render(node.left, names, constants)
+        right = _render(node.right, names, constants)
+        if left is None or right is None:
+            return None
+        return f"({left} {_BINOPS[type(node.op)]} {right})"
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARYOPS:
+        operand = _render(node.operand, names, constants)
+        if operand is None:
+            return None
+        return f"({_UNARYOPS[type(node.op)]}{operand})"
+    if isinstance(node, ast.Name):
+        if node.id not in names:
+            names.append(node.id)
+        return f"c{names.index(node.id)}{{i}}"
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float) and math.isfinite(node.value):
+        # Literals become kernel arguments, so the template only encodes the expression's shape
+        constants.append(node.value)
+        return f"k{len(constants) - 1}"
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse(expression: str) -> Optional[Tuple[str, Tuple[str, ...], Tuple[Union[int, float], ...]]]:
+    """Parse an expression into a kernel body template, its column names and its literals."""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        return None
+    names: List[str] = []
+    constants: List[Union[int, float]] = []
+    body = _render(tree.body, names, constants)
+    if body is None or not names:
+        return None
+    return body, tuple(names), tuple(constants)
+
+
+@functools.lru_cache(maxsize=64)
+def _kernel(body: str, n_columns: int, n_constants: int) -> Tuple[Callable, Callable]:
+    """Return the fused Numba kernel and the equivalent NumPy expression for ``body``.
+    
+    Kernels are shared by every expression with the same shape, whatever its
+    column names or literal values.
+    """
+    import numba
+
+    args = ", ".join([f"c{n}" for n in range(n_columns)] + [f"k{n}" for n in range(n_constants)])
+    source = (
+        f"def kernel({args}, out):\n"
+        f"    for i in prange(out.shape[0]):\n"
+        f"        out[i] = {body.format(i='[i]')}\n"
+        f"def vectorized({args}):\n"
+        f"    return {body.format(i='')}\n"
+    )
+    namespace: Dict[str, Any] = {"prange": numba.prange}
+    exec(source, namespace)
+    # error_model="numpy" keeps NumPy's inf/nan results for division by zero
+    kernel = numba.njit(parallel=True, error_model="numpy")(namespace["kernel"])
+    return kernel, namespace["vectorized"]
+
+
+def is_supported(expression: str) -> bool:
+    """Return True if ``expression`` is simple arithmetic that the fast path can handle."""
+    return _parse(expression) is not None
+
+
+def evaluate(df: pd.DataFrame, expression: str) -> Optional[np.ndarray]:
+    """
+    Evaluate ``expression`` against ``df`` with a fused Numba kernel.
+
+    Returns None when the expression or the referenced columns are not supported
+    (non-numeric or extension dtypes, unknown names), so the caller can fall back
+    to ``DataFrame.eval``.
+    """
+    parsed = _parse(expression)
+    if parsed is None:
+        return None
+    body, names, constants = parsed
+
+    arrays = []
+    for name in names:
+        if name not in df.columns:
+            return None
+        column = df[name]
+        if not isinstance(column, pd.Series) or not isinstance(column.dtype, np.dtype) or column.dtype.kind not in "iuf":
+            return None
+        arrays.append(column.to_numpy())
+
+    kernel, vectorized = _kernel(body, len(names), len(constants))
+    # Evaluating the NumPy form on empty slices gives the exact result dtype for free
+    dtype = np.asarray(vectorized(*(array[:0] for array in arrays), *constants)).dtype
+    if dtype.kind == "f":
+        # NumPy treats Python literals as "weak" and computes in the result dtype
+        # (e.g. float32); pass them as that type so Numba doesn't compute in float64
+        constants = tuple(dtype.type(constant) for constant in constants)
+    out = np.empty(len(df), dtype=dtype)
+    kernel(*arrays, *constants, out)
+    return out
@@ -1,11 +1,211 @@
 """
 DataFrame accessor providing enrichment methods.
 """
+import copy
+import functools
+import importlib.util
+import itertools
+import os
 import warnings
-from typing import Any, Optional, Union, Dict, Callable
+import weakref
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Optional, Union, Dict, Callable, Iterator
+import numpy as np
 import pandas as pd
-import pandera as pa
-import yaml
+
+from . import _numba_eval
+
+# pandera and yaml are imported lazily where they are needed, so that
+# ``import df_enrich`` (and e.g. cast/lookup) does not pay their import cost.
+if TYPE_CHECKING:
+    import pandera as pa
+
+# Schemas seen by validate() get a provenance token. Unlike id(), a token is never
+# reused once its schema is garbage-collected, so it can safely be stored in attrs.
+_SCHEMA_TOKEN_COUNTER = itertools.count(1)
+# id() -> token for live schemas only (entries are dropped when the schema dies)
+_SCHEMA_TOKENS: Dict[int, int] = {}
+# token -> schema, so the (potentially large) string form recorded as provenance
+# can be rebuilt on demand by describe_schema()
+_SCHEMA_REGISTRY: "weakref.WeakValueDictionary[int, pa.DataFrameSchema]" = weakref.WeakValueDictionary()
+
+# Per schema token: fingerprints of frames that passed validate(cache=True), oldest
+# first. A schema's entries are dropped as soon as the schema is garbage-collected.
+_VALIDATION_CACHE: Dict[int, Dict[tuple, None]] = {}
+_VALIDATION_CACHE_MAXSIZE = 1024
+# Rows hashed from each end of a frame when fingerprinting it for the validation cache.
+_VALIDATION_SAMPLE_ROWS = 512
+
+# numexpr only pays off once its start-up cost is amortised over enough rows.
+_HAS_NUMEXPR = importlib.util.find_spec("numexpr") is not None
+_NUMEXPR_MIN_ROWS = 10_000
+
+# Strings at least this long are parsed as inline YAML without checking for a file.
+_MAX_SPEC_PATH_LENGTH = 4096
+
+# Sets of missing columns cast() has already warned about, oldest first (used as
+# an ordered set so the oldest entry can be evicted once the bound is reached).
+_CAST_WARNED: Dict[frozenset, None] = {}
+_CAST_WARNED_MAXSIZE = 1024
+
+# Before Copy-on-Write (pandas < 3), astype deep-copies untouched columns unless
+# told otherwise; pandas 3 deprecates the ``copy`` keyword as it copies lazily.
+_ASTYPE_KWARGS: Dict[str, Any] = {"copy": False} if int(pd.__version__.split(".")[0]) < 3 else {}
+
+
+def _resolve_schema(schema: Union["pa.DataFrameSchema", type]) -> "pa.DataFrameSchema":
+    """Return the schema to validate against, compiling DataFrameModel classes."""
+    import pandera as pa
+    
+    # pandera caches the compiled schema on the model class itself
+    if isinstance(schema, type) and issubclass(schema, pa.DataFrameModel):
+        return schema.to_schema()
+    return schema
+
+
+def _schema_token(schema: "pa.DataFrameSchema") -> int:
+    """Return the provenance token for a schema, registering it on first sight."""
+    key = id(schema)
+    token = _SCHEMA_TOKENS.get(key)
+    if token is None:
+        token = next(_SCHEMA_TOKEN_COUNTER)
+        _SCHEMA_TOKENS[key] = token
+        _SCHEMA_REGISTRY[token] = schema
+        # Runs when the schema is collected, i.e. before its id() can be reused
+        weakref.finalize(schema, _forget_schema, key, token)
+    return token
+
+
+def _forget_schema(key: int, token: int) -> None:
+    """Drop the id mapping and cached validation results of a collected schema."""
+    _SCHEMA_TOKENS.pop(key, None)
+    _VALIDATION_CACHE.pop(token, None)
+
+
+def _schema_fingerprint(schema: "pa.DataFrameSchema", token: int) -> str:
+    """Return a short, stable label for a schema without stringifying its columns."""
+    return getattr(schema, 'name', None) or f"{type(schema).__name__}<{token}>"
+
+
+def _component_may_rewrite(component: Any) -> bool:
+    """Return True if a schema, column or index can change the data it validates."""
+    return bool(
+        getattr(component, 'coerce', False)
+        or getattr(component, 'parsers', None)
+        or getattr(component, 'drop_invalid_rows', False)
+        or getattr(component, 'default', None) is not None
+    )
+
+
+def _schema_may_rewrite(schema: "pa.DataFrameSchema") -> bool:
+    """Return True if validating against ``schema`` can return a different frame."""
+    if (
+        _component_may_rewrite(schema)
+        or getattr(schema, 'add_missing_columns', False)
+        or getattr(schema, 'strict', False) == "filter"
+    ):
+        return True
+    components = list((getattr(schema, 'columns', None) or {}).values())
+    index = getattr(schema, 'index', None)
+    if index is not None:
+        # MultiIndex components live under .indexes
+        components.extend(getattr(index, 'indexes', None) or [index])
+    return any(_component_may_rewrite(component) for component in components)
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> Optional[tuple]:
+    """Fingerprint a frame by its structure and a hash of its first and last rows."""
+    n = _VALIDATION_SAMPLE_ROWS
+    sample = df if len(df) <= 2 * n else pd.concat([df.iloc[:n], df.iloc[-n:]])
+    try:
+        row_hashes = pd.util.hash_pandas_object(sample, index=True).to_numpy()
+    except TypeError:
+        # Unhashable cell values (e.g. lists) - don't cache
+        return None
+    return (tuple(df.columns), tuple(df.dtypes), df.shape, hash(row_hashes.tobytes()))
+
+
+def _yaml_loader() -> type:
+    """Return the libyaml-backed safe loader when available."""
+    import yaml
+    
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_yaml_file(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML spec file; ``mtime_ns`` and ``size`` are part of the cache key only."""
+    import yaml
+    
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_yaml_loader())
+
+
+@functools.lru_cache(maxsize=64)
+def _load_yaml_string(text: str) -> Any:
+    """Parse an inline YAML spec."""
+    import yaml
+    
+    try:
+        return yaml.load(text, Loader=_yaml_loader())
+    except yaml.YAMLError:
+        raise ValueError(f"Invalid YAML specification: {text}")
+
+
+def _eval_engine(df: pd.DataFrame) -> str:
+    """Choose the ``DataFrame.eval`` engine for a frame of this size."""
+    if _HAS_NUMEXPR and len(df) >= _NUMEXPR_MIN_ROWS:
+        return "numexpr"
+    return "python"
+
+
+def _count_missing_values(values: np.ndarray) -> int:
+    """Count missing values in an array without materialising a boolean frame."""
+    if values.dtype.kind == 'f':
+        # NaN is the only value not equal to itself
+        return int(values.size - np.count_nonzero(values == values))
+    if values.dtype.kind in 'iub':
+        # Plain integer and boolean arrays cannot hold missing values
+        return 0
+    return int(np.count_nonzero(pd.isna(values)))
+
+
+def _count_missing_series(ser: pd.Series) -> int:
+    """Count missing values in a column, using the numpy path only for numpy dtypes."""
+    if isinstance(ser.dtype, np.dtype):
+        return _count_missing_values(ser.to_numpy())
+    # Extension dtypes (string, categorical, nullable) would convert to object arrays
+    return int(ser.isna().sum())
+
+
+def _count_missing(frame: pd.DataFrame) -> int:
+    """Count missing values across all columns, one column at a time."""
+    # Per column, so mixed dtypes are never consolidated into one object array
+    return sum(_count_missing_series(ser) for _, ser in frame.items())
+
+
+class _LazyProfile(Mapping):
+    """Read-only mapping whose values are computed on first access and then cached."""
+    
+    __slots__ = ('_thunks', '_cache')
+    
+    def __init__(self, thunks: Dict[str, Callable[[], Any]]):
+        self._thunks = thunks
+        self._cache: Dict[str, Any] = {}
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._cache:
+            self._cache[key] = self._thunks[key]()
+        return self._cache[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._thunks)
+    
+    def __len__(self) -> int:
+        return len(self._thunks)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._thunks)})"
 
 
 @pd.api.extensions.register_dataframe_accessor("enrich")
@@ -16,11 +216,15 @@ class EnrichAccessor:
     Access via: df.enrich.validate(schema), df.enrich.derive(spec), etc.
     """
     
+    # A new accessor is created for every DataFrame in a chain, so keep it small
+    __slots__ = ('_obj', '_config')
+    
     def __init__(self, pandas_obj: pd.DataFrame):
         self._obj = pandas_obj
-        self._config: Dict[str, Any] = {}
+        # Created on first use by config()
+        self._config: Optional[Dict[str, Any]] = None
         
-    def validate(self, schema: Union[pa.DataFrameSchema, type]) -> pd.DataFrame:
+    def validate(self, schema: Union["pa.DataFrameSchema", type], cache: bool = False) -> pd.DataFrame:
         """
         Validate DataFrame against a Pandera schema.
         
@@ -28,6 +232,12 @@ class EnrichAccessor:
         ----------
         schema : pa.DataFrameSchema or pandera SchemaModel
             The schema to validate against.
+        cache : bool, default False
+            If True, skip validation when a frame with the same columns, dtypes,
+            shape and a matching sample of rows (first and last rows, including
+            the index) has already passed this schema. Rows outside the sample
+            are not re-checked, so only enable this for streams of frames that
+            are known to be re-validations of the same data.
             
         Returns
         -------
@@ -44,22 +254,54 @@ class EnrichAccessor:
         >>> import pandera as pa
         >>> schema = pa.DataFrameSchema({"col1": pa.Column(int)})
         >>> df.enrich.validate(schema)
+        >>> df.enrich.validate(schema, cache=True)
         """
         # Handle both DataFrameSchema instances and SchemaModel classes
-        if isinstance(schema, type) and issubclass(schema, pa.DataFrameModel):
-            schema = schema.to_schema()
+        schema = _resolve_schema(schema)
         
-        validated_df = schema.validate(self._obj, lazy=False)
+        token = _schema_token(schema)
+        fingerprint = _frame_fingerprint(self._obj) if cache else None
+        passed = _VALIDATION_CACHE.get(token, {})
+        
+        if fingerprint is not None and fingerprint in passed:
+            validated_df = self._obj.copy(deep=False)
+        else:
+            validated_df = schema.validate(self._obj, lazy=False)
+            # A cache hit returns the input unchanged, so never cache schemas that
+            # can rewrite the frame (parsers, coercion, defaults, added/filtered columns)
+            if fingerprint is not None and not _schema_may_rewrite(schema):
+                passed = _VALIDATION_CACHE.setdefault(token, {})
+                if len(passed) >= _VALIDATION_CACHE_MAXSIZE:
+                    passed.pop(next(iter(passed)))
+                passed[fingerprint] = None
         
-        # Track provenance in attrs
-        if not hasattr(validated_df, 'attrs'):
-            validated_df.attrs = {}
+        # Track provenance in attrs; the full schema text is available via describe_schema()
         validated_df.attrs['enrich_validated'] = True
-        validated_df.attrs['enrich_schema'] = str(schema)
+        validated_df.attrs['enrich_schema'] = _schema_fingerprint(schema, token)
+        validated_df.attrs['enrich_schema_id'] = token
         
         return validated_df
     
-    def derive(self, spec: Union[str, Dict[str, str], Any]) -> pd.DataFrame:
+    def describe_schema(self) -> Optional[str]:
+        """
+        Describe the schema this DataFrame was validated against.
+        
+        Returns
+        -------
+        str or None
+            The full string form of the schema, or None if the DataFrame was not
+            validated or the schema object no longer exists.
+            
+        Examples
+        --------
+        >>> df.enrich.validate(schema).enrich.describe_schema()
+        """
+        schema = _SCHEMA_REGISTRY.get(self._obj.attrs.get('enrich_schema_id'))
+        if schema is None:
+            return None
+        return str(schema)
+    
+    def derive(self, spec: Union[str, Dict[str, str], Any], engine: str = "eval") -> pd.DataFrame:
         """
         Derive new columns using expressions via df-eval Engine.
         
@@ -70,6 +312,15 @@ class EnrichAccessor:
             - Dict mapping column names to expressions
             - YAML string with derivation rules
             - Path to YAML file
+        engine : {"eval", "numba"}, default "eval"
+            Evaluation engine:
+            - "eval": pandas ``DataFrame.eval``
+            - "numba": compile simple arithmetic over numeric columns (``+ - * /``
+              and numeric literals) into fused Numba kernels, falling back to
+              "eval" for anything else. Each new expression shape or input
+              dtype combination compiles once (a fraction of a second), so this
+              only pays off for repeated derivations on large frames. Requires
+              ``pip install df-enrich[fast]``.
             
         Returns
         -------
@@ -80,22 +331,35 @@ class EnrichAccessor:
         --------
         >>> df.enrich.derive({"total": "col1 + col2"})
         >>> df.enrich.derive("derived_columns.yaml")
+        >>> df.enrich.derive({"total": "col1 * col2 * 1.1"}, engine="numba")
         """
-        df = self._obj.copy()
+        if engine not in ("eval", "numba"):
+            raise ValueError(f"Unsupported derive engine: {engine}. Supported: 'eval', 'numba'")
+        use_numba = engine == "numba"
+        if use_numba and not _numba_eval.HAS_NUMBA:
+            warnings.warn(
+                "numba not installed. Install with: pip install df-enrich[fast]",
+                ImportWarning
+            )
+            use_numba = False
+        
+        # Shallow copy: new columns get fresh arrays, existing buffers are shared
+        df = self._obj.copy(deep=False)
         
         # Parse spec
         if isinstance(spec, str):
-            # Check if it's a file path or YAML string
-            try:
-                # Try to load as YAML file
-                with open(spec, 'r') as f:
-                    spec_dict = yaml.safe_load(f)
-            except (FileNotFoundError, IOError):
+            # Check if it's a file path or YAML string; long strings are never
+            # treated as paths so large inline specs don't hit the filesystem
+            if len(spec) < _MAX_SPEC_PATH_LENGTH and os.path.isfile(spec):
+                # Load as YAML file (cached until the file is modified); the size
+                # catches edits within one tick of a coarse-grained mtime
+                stat = os.stat(spec)
+                spec_dict = _load_yaml_file(os.path.abspath(spec), stat.st_mtime_ns, stat.st_size)
+            else:
                 # Treat as YAML string
-                try:
-                    spec_dict = yaml.safe_load(spec)
-                except yaml.YAMLError:
-                    raise ValueError(f"Invalid YAML specification: {spec}")
+                spec_dict = _load_yaml_string(spec)
+            # Parsed specs are cached and shared, so never hand out the cached object
+            spec_dict = copy.copy(spec_dict)
         elif isinstance(spec, dict):
             spec_dict = spec
         else:
@@ -103,15 +367,41 @@ class EnrichAccessor:
         
         # Apply derivations using pandas eval
         # This is a simple implementation; df-eval Engine would provide more features
-        for col_name, expression in spec_dict.items():
-            try:
-                df[col_name] = df.eval(expression)
-            except Exception as e:
-                raise ValueError(f"Failed to derive column '{col_name}' with expression '{expression}': {e}")
+        # Consecutive derivations are parsed and evaluated as one multi-line
+        # program; later lines can reference columns assigned by earlier ones.
+        # inplace=False matters: without Copy-on-Write (pandas < 3) an in-place
+        # eval assigns through .loc into buffers shared with the caller's frame.
+        # Plain column references are copied directly without going through eval,
+        # and with engine="numba" simple arithmetic runs as a fused Numba kernel.
+        eval_engine = _eval_engine(df)
+        program = []
+        try:
+            for col_name, expression in spec_dict.items():
+                source = str(expression).strip()
+                if source.isidentifier() or (use_numba and _numba_eval.is_supported(source)):
+                    if program:
+                        df = df.eval("\n".join(program), engine=eval_engine, inplace=False)
+                        program = []
+                    if source.isidentifier() and source in df.columns:
+                        df[col_name] = df[source]
+                        continue
+                    values = _numba_eval.evaluate(df, source) if use_numba else None
+                    if values is not None:
+                        df[col_name] = values
+                        continue
+                program.append(f"{col_name} = {expression}")
+            if program:
+                df = df.eval("\n".join(program), engine=eval_engine, inplace=False)
+        except Exception:
+            # Re-run column by column (from a clean copy) to report the failing derivation
+            df = self._obj.copy(deep=False)
+            for col_name, expression in spec_dict.items():
+                try:
+                    df[col_name] = df.eval(expression, engine=eval_engine)
+                except Exception as e:
+                    raise ValueError(f"Failed to derive column '{col_name}' with expression '{expression}': {e}")
         
         # Track provenance
-        if not hasattr(df, 'attrs'):
-            df.attrs = {}
         df.attrs['enrich_derived'] = True
         df.attrs['enrich_derivations'] = spec_dict
         
@@ -133,8 +423,9 @@ class EnrichAccessor:
             
         Returns
         -------
-        ProfileReport or dict
-            Profile report object or dictionary of statistics.
+        ProfileReport or Mapping
+            Profile report object, or a read-only mapping of basic statistics
+            (each computed on first access) when ydata-profiling is unavailable.
             
         Examples
         --------
@@ -162,14 +453,15 @@ class EnrichAccessor:
         else:
             raise ValueError(f"Unsupported profiling engine: {engine}. Supported: 'ydata'")
     
-    def _basic_profile(self) -> Dict[str, Any]:
-        """Generate basic profile statistics as fallback."""
-        return {
-            'shape': self._obj.shape,
-            'dtypes': self._obj.dtypes.to_dict(),
-            'missing': self._obj.isnull().sum().to_dict(),
-            'describe': self._obj.describe().to_dict(),
-        }
+    def _basic_profile(self) -> Mapping[str, Any]:
+        """Generate basic profile statistics as fallback (computed on first access)."""
+        df = self._obj
+        return _LazyProfile({
+            'shape': lambda: df.shape,
+            'dtypes': lambda: df.dtypes.to_dict(),
+            'missing': lambda: {col: _count_missing_series(ser) for col, ser in df.items()},
+            'describe': lambda: df.describe().to_dict(),
+        })
     
     def lookup(
         self,
@@ -210,19 +502,18 @@ class EnrichAccessor:
         >>> df.enrich.lookup(reference_df, dst="new_col")
         >>> df.enrich.lookup("registry://prices", dst="price", on_missing="raise")
         """
-        df = self._obj.copy()
-        
         # Handle custom resolver
         if resolver is not None:
-            df = resolver(df, src, dst)
+            # Resolvers may write in place, so hand them an independent copy
+            df = resolver(self._obj.copy(), src, dst)
             
             # Track provenance
-            if not hasattr(df, 'attrs'):
-                df.attrs = {}
             df.attrs['enrich_lookup'] = True
             
             return df
         
+        df = self._obj.copy(deep=False)
+        
         # Handle DataFrame source
         if isinstance(src, pd.DataFrame):
             # Simple merge operation - this is a placeholder
@@ -230,19 +521,29 @@ class EnrichAccessor:
             dst_cols = [dst] if isinstance(dst, str) else dst
             
             # Validate that destination columns exist in source
-            missing_cols = [col for col in dst_cols if col not in src.columns]
+            src_cols = set(src.columns)
+            missing_cols = [col for col in dst_cols if col not in src_cols]
             if missing_cols:
                 raise ValueError(f"Columns {missing_cols} not found in source DataFrame. Available columns: {list(src.columns)}")
             
-            # For now, do a simple index-based merge
+            # For now, do a simple index-based lookup
             # In a real implementation, this would be more sophisticated
-            # Try to merge on index
-            result = df.merge(src[dst_cols], left_index=True, right_index=True, how='left', suffixes=('', '_lookup'))
+            if src.index.is_unique and not any(col in df.columns for col in dst_cols):
+                # Each row matches at most one source row, so index-aligned
+                # assignment gives the same result as a left merge without
+                # building a join (and without any reindexing if indexes are equal)
+                result = df
+                for col in dst_cols:
+                    result[col] = src[col]
+            else:
+                # Duplicate source keys (or clashing column names) need join semantics
+                result = df.merge(src[dst_cols], left_index=True, right_index=True, how='left', suffixes=('', '_lookup'))
             
-            # Handle missing values - always sum over all columns
-            missing_count = result[dst_cols].isnull().sum().sum()
-            
-            if missing_count > 0:
+            # Handle missing values - a cheap per-column check stops at the first
+            # column with gaps; the full count is only needed for the message
+            if on_missing != "ignore" and any(result[col].hasnans for col in dst_cols):
+                missing_count = _count_missing(result[dst_cols])
+                
                 if on_missing == "raise":
                     raise ValueError(f"Lookup failed: {missing_count} missing values in {dst_cols}")
                 elif on_missing == "warn":
@@ -262,8 +563,6 @@ class EnrichAccessor:
             raise TypeError(f"src must be str or DataFrame, got {type(src)}")
         
         # Track provenance
-        if not hasattr(df, 'attrs'):
-            df.attrs = {}
         df.attrs['enrich_lookup'] = True
         
         return df
@@ -286,6 +585,8 @@ class EnrichAccessor:
         --------
         >>> df.enrich.config(registry_url="https://api.example.com")
         """
+        if self._config is None:
+            self._config = {}
         self._config.update(kwargs)
         return self
     
@@ -303,27 +604,42 @@ class EnrichAccessor:
         pd.DataFrame
             DataFrame with casted columns (enables chaining).
             
+        Warns
+        -----
+        UserWarning
+            If columns in ``dtype_spec`` are missing from the DataFrame. The
+            warning is issued once per process for each distinct set of missing
+            columns (regardless of warning filters or which DataFrame is cast),
+            so repeated casts in a loop stay quiet.
+            
         Examples
         --------
         >>> df.enrich.cast({"col1": "int64", "col2": "float32"})
         """
-        df = self._obj.copy()
+        df = self._obj
         
         # Validate columns exist
         missing_cols = [col for col in dtype_spec.keys() if col not in df.columns]
-        if missing_cols:
+        # Only warn once per set of missing columns; repeated casts in a loop
+        # would otherwise pay for warnings.warn on every call
+        signature = frozenset(missing_cols)
+        if missing_cols and signature not in _CAST_WARNED:
             warnings.warn(
                 f"Columns {missing_cols} not found in DataFrame. Available columns: {list(df.columns)}. "
                 "These columns will be skipped."
             )
+            if len(_CAST_WARNED) >= _CAST_WARNED_MAXSIZE:
+                _CAST_WARNED.pop(next(iter(_CAST_WARNED)))
+            _CAST_WARNED[signature] = None
         
-        for col, dtype in dtype_spec.items():
-            if col in df.columns:
-                df[col] = df[col].astype(dtype)
+        # Cast all columns in a single pass; astype returns a new frame
+        valid_spec = {col: dtype for col, dtype in dtype_spec.items() if col in df.columns}
+        if valid_spec:
+            df = df.astype(valid_spec, **_ASTYPE_KWARGS)
+        else:
+            df = df.copy(deep=False)
         
         # Track provenance
-        if not hasattr(df, 'attrs'):
-            df.attrs = {}
         df.attrs['enrich_cast'] = True
         df.attrs['enrich_dtypes'] = dtype_spec
         
@@ -1,9 +1,17 @@
 """
 Tests for df-enrich accessor.
 """
+import gc
+import os
+import subprocess
+import sys
+import warnings
+
+import numpy as np
 import pytest
 import pandas as pd
 import pandera as pa
+import df_enrich.accessor
 from df_enrich import EnrichAccessor
 
 
@@ -16,6 +24,15 @@ class TestEnrichAccessor:
         assert hasattr(df, "enrich")
         assert isinstance(df.enrich, EnrichAccessor)
     
+    def test_import_defers_pandera_and_yaml(self):
+        """Test that importing df_enrich defers pandera and yaml imports."""
+        code = (
+            "import sys, df_enrich; "
+            "assert 'pandera' not in sys.modules; "
+            "assert 'yaml' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+    
     def test_accessor_object_reference(self):
         """Test that accessor maintains reference to parent DataFrame."""
         df = pd.DataFrame({"a": [1, 2, 3]})
@@ -50,6 +67,87 @@ class TestValidate:
         assert isinstance(result, pd.DataFrame)
         assert "enrich_validated" in result.attrs
     
+    def test_validate_reuses_compiled_schema(self):
+        """Test that repeated validation reuses the compiled model schema."""
+        class CachedSchema(pa.DataFrameModel):
+            a: int
+        
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        first = df.enrich.validate(CachedSchema)
+        second = df.enrich.validate(CachedSchema)
+        
+        assert first.attrs["enrich_schema"] == "CachedSchema"
+        assert first.attrs["enrich_schema_id"] == second.attrs["enrich_schema_id"]
+    
+    def test_validate_schema_model_subclass(self):
+        """Test that a subclassed model is compiled independently of its parent."""
+        class ParentSchema(pa.DataFrameModel):
+            a: int
+        
+        class ChildSchema(ParentSchema):
+            b: int
+        
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        df.enrich.validate(ParentSchema)
+        
+        with pytest.raises(pa.errors.SchemaError):
+            df.enrich.validate(ChildSchema)
+    
+    def test_validate_cache_skips_revalidation(self):
+        """Test that cache=True skips checks for an identical frame only."""
+        calls = []
+        
+        def positive(series):
+            calls.append(len(series))
+            return series > 0
+        
+        schema = pa.DataFrameSchema({"a": pa.Column(int, pa.Check(positive))})
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        
+        df.enrich.validate(schema, cache=True)
+        result = df.copy().enrich.validate(schema, cache=True)
+        assert len(calls) == 1
+        assert result.attrs["enrich_validated"] is True
+        
+        df.enrich.validate(schema)
+        assert len(calls) == 2
+        
+        with pytest.raises(pa.errors.SchemaError):
+            pd.DataFrame({"a": [1, -2, 3]}).enrich.validate(schema, cache=True)
+    
+    def test_validate_cache_after_schema_collected(self, monkeypatch):
+        """Test that cached results of a collected schema never apply to a new one."""
+        # Force every schema to report the same id(), as CPython may after collection
+        monkeypatch.setattr(df_enrich.accessor, "id", lambda obj: 42, raising=False)
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        
+        permissive = pa.DataFrameSchema({"a": pa.Column(int)})
+        df.enrich.validate(permissive, cache=True)
+        token = df_enrich.accessor._SCHEMA_TOKENS[42]
+        assert token in df_enrich.accessor._VALIDATION_CACHE
+        del permissive
+        gc.collect()
+        assert token not in df_enrich.accessor._VALIDATION_CACHE
+        
+        strict = pa.DataFrameSchema({"a": pa.Column(int, pa.Check.gt(5))})
+        pd.DataFrame({"a": [6, 7]}).enrich.validate(strict, cache=True)
+        
+        with pytest.raises(pa.errors.SchemaError):
+            df.enrich.validate(strict, cache=True)
+    
+    def test_validate_cache_ignores_rewriting_schema(self):
+        """Test that cache=True never returns unparsed input for a parser schema."""
+        schema = pa.DataFrameSchema({
+            "a": pa.Column(float, parsers=pa.Parser(lambda s: s.clip(lower=0)))
+        })
+        df = pd.DataFrame({"a": [-1.0, 2.0]})
+        
+        first = df.enrich.validate(schema, cache=True)
+        second = df.enrich.validate(schema, cache=True)
+        
+        assert list(first["a"]) == [0.0, 2.0]
+        assert list(second["a"]) == [0.0, 2.0]
+    
     def test_validate_failure(self):
         """Test that validation raises on schema violation."""
         df = pd.DataFrame({"a": ["x", "y", "z"], "b": [4, 5, 6]})
@@ -88,6 +186,96 @@ class TestDerive:
         assert list(result["c"]) == [5, 7, 9]
         assert list(result["d"]) == [4, 10, 18]
     
+    def test_derive_chained_references(self):
+        """Test that later derivations can reference earlier derived columns."""
+        df = pd.DataFrame({"price": [10.0, 20.0], "quantity": [2, 3]})
+        result = df.enrich.derive({
+            "total": "price * quantity",
+            "discount": "total * 0.1",
+            "final_price": "total - discount"
+        })
+        
+        assert list(result["total"]) == [20.0, 60.0]
+        assert list(result["final_price"]) == pytest.approx([18.0, 54.0])
+    
+    def test_derive_column_alias(self):
+        """Test that plain column references copy the (current) column."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        result = df.enrich.derive({"b": "a", "a": "a * 10", "c": "a"})
+        
+        assert list(result["b"]) == [1, 2, 3]
+        assert list(result["c"]) == [10, 20, 30]
+    
+    def test_derive_non_identifier_column_name(self):
+        """Test deriving a column whose name is not a valid identifier."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        result = df.enrich.derive({"a plus one": "a + 1"})
+        
+        assert list(result["a plus one"]) == [2, 3, 4]
+    
+    def test_derive_numba_fast_path(self, monkeypatch):
+        """Test that the Numba fast path matches pandas eval results."""
+        pytest.importorskip("numba")
+        df = pd.DataFrame({"price": [10.0, 20.0, 0.0], "quantity": [2, 3, 0]})
+        spec = {
+            "total": "price * quantity",
+            "discount": "total * 0.1",
+            "final_price": "total - discount",
+            "units": "quantity + 1",
+            "ratio": "price / quantity",
+            "expensive": "price > 15",
+        }
+        result = df.enrich.derive(spec, engine="numba")
+        
+        expected = df.copy()
+        for col_name, expression in spec.items():
+            expected[col_name] = expected.eval(expression)
+        pd.testing.assert_frame_equal(result, expected)
+    
+    def test_derive_numba_kernel_shared_across_literals(self):
+        """Test that expressions differing only in literals reuse one kernel."""
+        pytest.importorskip("numba")
+        from df_enrich import _numba_eval
+        
+        df = pd.DataFrame({"price": [10.0, 20.0]})
+        df.enrich.derive({"d": "price * 0.1"}, engine="numba")
+        misses = _numba_eval._kernel.cache_info().misses
+        result = df.enrich.derive({"d": "price * 0.15"}, engine="numba")
+        
+        assert _numba_eval._kernel.cache_info().misses == misses
+        assert list(result["d"]) == pytest.approx([1.5, 3.0])
+    
+    def test_derive_numba_float32_matches_eval(self):
+        """Test that float32 results match eval exactly (no float64 intermediates)."""
+        pytest.importorskip("numba")
+        df = pd.DataFrame({
+            "a": np.linspace(0.1, 1000.0, 257, dtype="float32"),
+            "b": np.linspace(3.3, 7.7, 257, dtype="float32"),
+        })
+        spec = {"c": "a * 0.1", "d": "a * 0.3 + b / 7.0"}
+        
+        result = df.enrich.derive(spec, engine="numba")
+        expected = df.enrich.derive(spec)
+        
+        assert result["c"].dtype == "float32"
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    
+    def test_derive_numba_does_not_alias_arithmetic_column_names(self):
+        """Test that arithmetic is computed even when a column shares its text."""
+        pytest.importorskip("numba")
+        df = pd.DataFrame({"a": [1, 2], "b": [10, 20], "a+b": [0, 0]})
+        
+        result = df.enrich.derive({"c": "a+b"}, engine="numba")
+        
+        assert list(result["c"]) == [11, 22]
+    
+    def test_derive_unsupported_engine(self):
+        """Test that unsupported derive engines raise errors."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        
+        with pytest.raises(ValueError, match="Unsupported derive engine"):
+            df.enrich.derive({"b": "a + 1"}, engine="unsupported")
+    
     def test_derive_with_yaml_string(self):
         """Test deriving columns with YAML string."""
         df = pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6]})
@@ -100,12 +288,69 @@ class TestDerive:
         assert "c" in result.columns
         assert "d" in result.columns
     
+    def test_derive_does_not_mutate_input(self):
+        """Test that derive leaves the original DataFrame untouched."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        result = df.enrich.derive({"a": "a * 10", "b": "a + 1"})
+        
+        assert list(df["a"]) == [1, 2, 3]
+        assert list(df.columns) == ["a"]
+        assert "enrich_derived" not in df.attrs
+        assert list(result["a"]) == [10, 20, 30]
+    
+    def test_derive_with_yaml_file(self, tmp_path):
+        """Test deriving from a YAML file picks up edits to the file."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        spec_path = tmp_path / "spec.yaml"
+        spec_path.write_text('b: "a * 2"\n')
+        
+        result = df.enrich.derive(str(spec_path))
+        assert list(result["b"]) == [2, 4, 6]
+        
+        # An edit that keeps the same mtime (coarse timestamps) but changes the size
+        mtime_ns = os.stat(spec_path).st_mtime_ns
+        spec_path.write_text('b: "a * 30"\n')
+        os.utime(spec_path, ns=(mtime_ns, mtime_ns))
+        
+        result = df.enrich.derive(str(spec_path))
+        assert list(result["b"]) == [30, 60, 90]
+        
+        # A same-size edit with a newer mtime
+        spec_path.write_text('b: "a * 40"\n')
+        os.utime(spec_path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+        
+        result = df.enrich.derive(str(spec_path))
+        assert list(result["b"]) == [40, 80, 120]
+    
+    def test_derive_invalid_yaml_string(self):
+        """Test that malformed inline YAML raises ValueError."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        
+        with pytest.raises(ValueError, match="Invalid YAML specification"):
+            df.enrich.derive("b: [unclosed")
+    
+    def test_derive_failure_does_not_mutate_input(self):
+        """Test that a derive failing partway leaves the original DataFrame untouched."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        
+        with pytest.raises(ValueError):
+            df.enrich.derive({"a": "a * 10", "c": "nonexistent + 1"})
+        
+        assert list(df["a"]) == [1, 2, 3]
+    
     def test_derive_invalid_expression(self):
         """Test that invalid expressions raise errors."""
         df = pd.DataFrame({"a": [1, 2, 3]})
         
         with pytest.raises(ValueError):
             df.enrich.derive({"bad": "nonexistent_col + 1"})
+    
+    def test_derive_error_names_failing_column(self):
+        """Test that a failing batch reports the offending column."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        
+        with pytest.raises(ValueError, match="'bad'"):
+            df.enrich.derive({"ok": "a + 1", "bad": "nonexistent_col + 1"})
 
 
 class TestProfile:
@@ -124,6 +369,35 @@ class TestProfile:
         except ImportError:
             pytest.skip("ydata-profiling not installed")
     
+    def test_basic_profile_is_lazy(self, monkeypatch):
+        """Test that the fallback profile only computes the entries accessed."""
+        df = pd.DataFrame({"a": [1.0, None, 3.0], "b": [5, 4, 3]})
+        
+        def fail_describe(*args, **kwargs):
+            raise AssertionError("describe() should not be called")
+        
+        monkeypatch.setattr(pd.DataFrame, "describe", fail_describe)
+        profile = df.enrich._basic_profile()
+        
+        assert set(profile) == {"shape", "dtypes", "missing", "describe"}
+        assert profile["shape"] == (3, 2)
+        assert profile["missing"] == {"a": 1, "b": 0}
+        
+        monkeypatch.undo()
+        assert profile["describe"] == df.describe().to_dict()
+    
+    def test_basic_profile_missing_mixed_dtypes(self):
+        """Test missing-value counts across float, integer, nullable and object columns."""
+        df = pd.DataFrame({
+            "f": [1.0, None, None],
+            "i": [1, 2, 3],
+            "n": pd.array([1, None, 3], dtype="Int64"),
+            "s": ["x", None, "z"],
+            "t": pd.to_datetime(["2024-01-01", None, None]),
+        })
+        
+        assert df.enrich._basic_profile()["missing"] == df.isna().sum().to_dict()
+    
     def test_profile_unsupported_engine(self):
         """Test that unsupported engines raise errors."""
         df = pd.DataFrame({"a": [1, 2, 3]})
@@ -145,6 +419,39 @@ class TestLookup:
         assert "price" in result.columns
         assert "enrich_lookup" in result.attrs
     
+    def test_lookup_unaligned_index(self):
+        """Test lookup aligns on index labels rather than position."""
+        df = pd.DataFrame({"a": [1, 2, 3]}, index=["x", "y", "x"])
+        lookup_df = pd.DataFrame({"price": [20, 10]}, index=["y", "x"])
+        
+        result = df.enrich.lookup(lookup_df, dst="price")
+        
+        assert list(result["price"]) == [10, 20, 10]
+        assert list(result.index) == ["x", "y", "x"]
+    
+    def test_lookup_duplicate_source_keys(self):
+        """Test lookup keeps join semantics for duplicate source keys."""
+        df = pd.DataFrame({"a": [1, 2]}, index=[0, 1])
+        lookup_df = pd.DataFrame({"price": [10, 11, 20]}, index=[0, 0, 1])
+        
+        result = df.enrich.lookup(lookup_df, dst="price")
+        
+        assert list(result["price"]) == [10, 11, 20]
+        assert list(result["a"]) == [1, 1, 2]
+    
+    def test_lookup_missing_values(self):
+        """Test on_missing handling when source keys are absent."""
+        df = pd.DataFrame({"a": [1, 2, 3]}, index=[0, 1, 2])
+        lookup_df = pd.DataFrame({"price": [10.0], "name": ["x"]}, index=[0])
+        
+        with pytest.warns(UserWarning, match="4 missing values"):
+            df.enrich.lookup(lookup_df, dst=["price", "name"])
+        with pytest.raises(ValueError, match="4 missing values"):
+            df.enrich.lookup(lookup_df, dst=["price", "name"], on_missing="raise")
+        
+        result = df.enrich.lookup(lookup_df, dst="price", on_missing="ignore")
+        assert result["price"].isna().sum() == 2
+    
     def test_lookup_with_missing_columns(self):
         """Test that lookup validates column existence in source."""
         df = pd.DataFrame({"a": [1, 2, 3]}, index=[0, 1, 2])
@@ -177,6 +484,11 @@ class TestLookup:
 class TestCast:
     """Test cast() method."""
     
+    @pytest.fixture(autouse=True)
+    def reset_cast_warnings(self, monkeypatch):
+        """Isolate tests from the process-wide record of cast warnings."""
+        monkeypatch.setattr(df_enrich.accessor, "_CAST_WARNED", {})
+    
     def test_cast_dtypes(self):
         """Test casting column dtypes."""
         df = pd.DataFrame({"a": [1, 2, 3], "b": [4.0, 5.0, 6.0]})
@@ -186,6 +498,15 @@ class TestCast:
         assert result["b"].dtype == "float32"
         assert "enrich_cast" in result.attrs
     
+    def test_cast_does_not_mutate_input(self):
+        """Test that cast leaves the original DataFrame untouched."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        result = df.enrich.cast({"a": "float32"})
+        
+        assert df["a"].dtype == "int64"
+        assert "enrich_cast" not in df.attrs
+        assert result["a"].dtype == "float32"
+    
     def test_cast_with_missing_columns(self):
         """Test that cast warns about missing columns."""
         df = pd.DataFrame({"a": [1, 2, 3]})
@@ -195,6 +516,19 @@ class TestCast:
         
         # Should still cast existing columns
         assert result["a"].dtype == "int64"
+    
+    def test_cast_warns_once_per_missing_columns(self):
+        """Test that repeated casts only warn once for the same missing columns."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        
+        with pytest.warns(UserWarning, match="not found in DataFrame"):
+            df.enrich.cast({"a": "int64", "missing_x": "float32", "missing_y": "int8"})
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = df.enrich.cast({"missing_y": "int8", "missing_x": "float32"})
+        
+        assert "enrich_cast" in result.attrs
 
 
 class TestConfig:
@@ -207,6 +541,14 @@ class TestConfig:
         
         assert accessor._config["registry_url"] == "https://api.example.com"
         assert isinstance(accessor, EnrichAccessor)
+    
+    def test_config_accumulates(self):
+        """Test that repeated config calls merge options."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        accessor = df.enrich
+        accessor.config(registry_url="https://api.example.com").config(timeout=5)
+        
+        assert accessor._config == {"registry_url": "https://api.example.com", "timeout": 5}
 
 
 class TestChaining:
@@ -249,6 +591,33 @@ class TestProvenance:
         assert "enrich_validated" in result.attrs
         assert "enrich_schema" in result.attrs
     
+    def test_describe_schema(self):
+        """Test that the full schema description is available on demand."""
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        schema = pa.DataFrameSchema({"a": pa.Column(int)})
+        
+        result = df.enrich.validate(schema)
+        
+        assert result.enrich.describe_schema() == str(schema)
+        assert df.enrich.describe_schema() is None
+    
+    def test_describe_schema_after_schema_collected(self, monkeypatch):
+        """Test that provenance never points at a later schema that reuses an id()."""
+        # Force every schema to report the same id(), as CPython may after collection
+        monkeypatch.setattr(df_enrich.accessor, "id", lambda obj: 42, raising=False)
+        df = pd.DataFrame({"a": [1, 2, 3]})
+        schema = pa.DataFrameSchema({"a": pa.Column(int)})
+        # The validated frame itself keeps the schema alive (pandera attaches it), but
+        # provenance in attrs is carried on to later frames in a chain
+        result = df.enrich.validate(schema).enrich.derive({"b": "a + 1"})
+        
+        del schema
+        gc.collect()
+        other = pa.DataFrameSchema({"a": pa.Column(int, pa.Check.ge(0))})
+        df.enrich.validate(other)
+        
+        assert result.enrich.describe_schema() is None
+    
     def test_provenance_derive(self):
         """Test provenance for derive operations."""
         df = pd.DataFrame({"a": [1, 2, 3]})